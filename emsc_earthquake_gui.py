@@ -3,28 +3,103 @@
 EMSC Deprem Veri İndirici - Grafik Kullanıcı Arayüzü
 
 Bu script, EMSC (Avrupa-Akdeniz Sismoloji Merkezi) API'sinden deprem verilerini
-kullanıcının belirttiği bölge ve zaman aralığına göre indirir ve CSV dosyası olarak kaydeder.
+kullanıcının belirttiği bölge ve zaman aralığına göre indirir ve CSV, Parquet, Feather veya JSON Lines dosyası olarak kaydeder.
 """
 
+try:
+    # tkthread, diğer iş parçacıklarından yapılan Tcl çağrılarını ana yorumlayıcıya
+    # doğrudan iletir; tkinter içe aktarılmadan ve Tk oluşturulmadan önce yamalanmalı
+    import tkthread
+    tkthread.patch()
+except ImportError:
+    tkthread = None
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 import datetime
-import sys
-import os
-from dateutil import parser as date_parser
 import threading
 
-# emsc_earthquake_data.py'den fonksiyonları içe aktarıyoruz
-from emsc_earthquake_data import (
-    validate_dates, 
-    format_date_for_api, 
-    get_earthquake_data, 
-    process_earthquake_data, 
-    save_to_csv
+# Hazır bölgeler: (min_lat, max_lat, min_lon, max_lon)
+REGION_PRESETS = {
+    "Türkiye": (36.0, 42.0, 26.0, 45.0),
+    "İstanbul": (40.8, 41.3, 28.5, 29.5),
+    "İzmir": (38.0, 38.7, 26.5, 27.5),
+    "Ankara": (39.5, 40.2, 32.5, 33.5),
+    "Dünya": (-90.0, 90.0, -180.0, 180.0)
+}
+
+# Hazır zaman aralıkları: geriye doğru gün sayısı
+TIME_PRESETS = {
+    "Son 24 Saat": 1,
+    "Son 7 Gün": 7,
+    "Son 30 Gün": 30,
+    "Son 90 Gün": 90,
+    "Son 365 Gün": 365
+}
+
+# Açılır listelerde gösterilen adlar, içe aktarma sırasında bir kez hesaplanır
+REGION_NAMES = tuple(REGION_PRESETS)
+TIME_NAMES = tuple(TIME_PRESETS)
+
+# Sayısal giriş alanları: (anahtar, form etiketi)
+NUMERIC_FIELDS = (
+    ("min_lat", "Minimum Enlem"),
+    ("max_lat", "Maksimum Enlem"),
+    ("min_lon", "Minimum Boylam"),
+    ("max_lon", "Maksimum Boylam"),
+    ("min_mag", "Minimum Büyüklük"),
+    ("max_mag", "Maksimum Büyüklük")
 )
 
+# Aralık denetimleri: (minimum anahtarı, maksimum anahtarı, alt sınır, üst sınır, hata mesajı)
+RANGE_CHECKS = (
+    ("min_lat", "max_lat", -90.0, 90.0,
+     "Geçersiz enlem değerleri. Enlem -90 ile 90 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır."),
+    ("min_lon", "max_lon", -180.0, 180.0,
+     "Geçersiz boylam değerleri. Boylam -180 ile 180 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır."),
+    ("min_mag", "max_mag", 0.0, 10.0,
+     "Geçersiz büyüklük değerleri. Büyüklük 0 ile 10 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır.")
+)
+
+# Fare tekerleği bağlamalarının yapıldığı, yalnızca kaydırılabilir alandaki öğelere eklenen etiket
+SCROLL_TAG = "EMSCScrollArea"
+
+# İndirme alt sürecinde ilerleme bildirimlerinin yazıldığı kuyruk
+_progress_queue = None
+
+def _init_download_process(progress_queue):
+    """İndirme alt sürecini hazırla: ilerleme kuyruğunu sakla."""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+def _put_progress(done, total):
+    """Tamamlanan istek sayısını ana sürece bildir."""
+    _progress_queue.put((done, total))
+
+def _run_download(params):
+    """Alt süreçte verileri indir, işle ve kaydet; yazılan kayıt sayısını döndür."""
+    from emsc_earthquake_data import download_to_file
+    
+    return download_to_file(
+        params["min_lat"], params["max_lat"],
+        params["min_lon"], params["max_lon"],
+        params["start_date"], params["end_date"],
+        params["min_mag"], params["max_mag"],
+        params["output_file"], debug=params["debug"],
+        on_progress=_put_progress
+    )
+
 class EMSCEarthquakeGUI:
+    # Örnek başına __dict__ oluşturulmaz; indirme iş parçacığının eriştiği
+    # öznitelikler doğrudan yuvalardan okunur
+    __slots__ = (
+        "root",
+        "min_lat_var", "max_lat_var", "min_lon_var", "max_lon_var", "_coord_vars",
+        "region_var", "start_date_var", "end_date_var", "time_var",
+        "min_mag_var", "max_mag_var", "output_var", "debug_var",
+        "status_var", "progress", "download_button", "_download_pool", "_download_queue", "_closing"
+    )
+    
     def __init__(self, root):
         self.root = root
         self.root.title("EMSC Deprem Veri İndirici")
@@ -32,6 +107,15 @@ class EMSCEarthquakeGUI:
         self.root.resizable(True, True)
         self.root.minsize(700, 700)  # Minimum pencere boyutu
         
+        # İndirme süreci ilk indirmede oluşturulur ve pencere kapanana kadar yeniden kullanılır
+        self._download_pool = None
+        self._download_queue = None
+        self._closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Özel buton stili, buton oluşturulmadan önce bir kez tanımlanır
+        ttk.Style(root).configure("Download.TButton", font=("Arial", 12, "bold"))
+        
         # Ana çerçeve - Kaydırma çubuğu ile
         container = ttk.Frame(root)
         container.pack(fill=tk.BOTH, expand=True)
@@ -43,11 +127,22 @@ class EMSCEarthquakeGUI:
         # Kaydırılabilir çerçeve
         main_frame = ttk.Frame(canvas, padding="10")
         
-        # Kaydırma çubuğunu yapılandır
-        main_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Kaydırma çubuğunu yapılandır: arka arkaya gelen Configure olaylarında
+        # kaydırma alanı boşta kalma anında bir kez hesaplanır
+        scrollregion_pending = False
+        
+        def _update_scrollregion():
+            nonlocal scrollregion_pending
+            scrollregion_pending = False
+            canvas.configure(scrollregion=canvas.bbox("all"))
+        
+        def _on_frame_configure(event):
+            nonlocal scrollregion_pending
+            if not scrollregion_pending:
+                scrollregion_pending = True
+                canvas.after_idle(_update_scrollregion)
+        
+        main_frame.bind("<Configure>", _on_frame_configure)
         
         # Çerçeveyi canvas'a ekle
         canvas.create_window((0, 0), window=main_frame, anchor="nw")
@@ -57,13 +152,31 @@ class EMSCEarthquakeGUI:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Fare tekerleği ile kaydırma işlevi
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)  # Windows için
-        canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))  # Linux için yukarı kaydırma
-        canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))   # Linux için aşağı kaydırma
+        # Fare tekerleği ile kaydırma işlevi: bir boşta kalma anına kadar gelen
+        # tekerlek olayları biriktirilir ve tek bir yview_scroll çağrısıyla uygulanır
+        wheel_delta = 0
+        wheel_pending = False
+        
+        def _flush_wheel():
+            nonlocal wheel_delta, wheel_pending
+            wheel_pending = False
+            # 120 birim bir tekerlek adımıdır; küçük dokunmatik yüzey değerleri kalan olarak saklanır
+            units = int(wheel_delta / 120)
+            wheel_delta -= units * 120
+            if units:
+                canvas.yview_scroll(-units, "units")
+        
+        def _on_mousewheel(delta):
+            nonlocal wheel_delta, wheel_pending
+            wheel_delta += delta
+            if not wheel_pending:
+                wheel_pending = True
+                canvas.after_idle(_flush_wheel)
+        
+        # bind_all yerine yalnızca canvas ve içindeki öğelere eklenen bir etikete bağlanır
+        root.bind_class(SCROLL_TAG, "<MouseWheel>", lambda e: _on_mousewheel(e.delta))  # Windows için
+        root.bind_class(SCROLL_TAG, "<Button-4>", lambda e: _on_mousewheel(120))  # Linux için yukarı kaydırma
+        root.bind_class(SCROLL_TAG, "<Button-5>", lambda e: _on_mousewheel(-120))  # Linux için aşağı kaydırma
         
         # Başlık
         title_label = ttk.Label(main_frame, text="EMSC Deprem Veri İndirici", font=("Arial", 16, "bold"))
@@ -96,22 +209,17 @@ class EMSCEarthquakeGUI:
         self.max_lon_var = tk.StringVar(value="45.0")  # Türkiye'nin doğu sınırı yaklaşık
         ttk.Entry(coords_frame, textvariable=self.max_lon_var, width=15).grid(row=1, column=3, padx=5, pady=5)
         
+        # Hazır bölge seçildiğinde birlikte güncellenen koordinat değişkenleri
+        self._coord_vars = (self.min_lat_var, self.max_lat_var, self.min_lon_var, self.max_lon_var)
+        
         # Hazır bölge seçenekleri
         preset_frame = ttk.Frame(region_frame)
         preset_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(preset_frame, text="Hazır Bölge:").grid(row=0, column=0, sticky=tk.W, padx=5)
         
-        self.region_presets = {
-            "Türkiye": {"min_lat": 36.0, "max_lat": 42.0, "min_lon": 26.0, "max_lon": 45.0},
-            "İstanbul": {"min_lat": 40.8, "max_lat": 41.3, "min_lon": 28.5, "max_lon": 29.5},
-            "İzmir": {"min_lat": 38.0, "max_lat": 38.7, "min_lon": 26.5, "max_lon": 27.5},
-            "Ankara": {"min_lat": 39.5, "max_lat": 40.2, "min_lon": 32.5, "max_lon": 33.5},
-            "Dünya": {"min_lat": -90.0, "max_lat": 90.0, "min_lon": -180.0, "max_lon": 180.0}
-        }
-        
         self.region_var = tk.StringVar()
-        region_combo = ttk.Combobox(preset_frame, textvariable=self.region_var, values=list(self.region_presets.keys()), width=15)
+        region_combo = ttk.Combobox(preset_frame, textvariable=self.region_var, values=REGION_NAMES, width=15)
         region_combo.grid(row=0, column=1, padx=5)
         region_combo.bind("<<ComboboxSelected>>", self.on_region_selected)
         
@@ -143,16 +251,8 @@ class EMSCEarthquakeGUI:
         
         ttk.Label(time_preset_frame, text="Hazır Zaman Aralığı:").grid(row=0, column=0, sticky=tk.W, padx=5)
         
-        self.time_presets = {
-            "Son 24 Saat": {"days": 1},
-            "Son 7 Gün": {"days": 7},
-            "Son 30 Gün": {"days": 30},
-            "Son 90 Gün": {"days": 90},
-            "Son 365 Gün": {"days": 365}
-        }
-        
         self.time_var = tk.StringVar()
-        time_combo = ttk.Combobox(time_preset_frame, textvariable=self.time_var, values=list(self.time_presets.keys()), width=15)
+        time_combo = ttk.Combobox(time_preset_frame, textvariable=self.time_var, values=TIME_NAMES, width=15)
         time_combo.grid(row=0, column=1, padx=5)
         time_combo.bind("<<ComboboxSelected>>", self.on_time_selected)
         
@@ -194,175 +294,304 @@ class EMSCEarthquakeGUI:
         # Sütun ağırlıklarını ayarla
         output_file_frame.columnconfigure(1, weight=1)  # Giriş alanının genişlemesini sağla
         
+        # Hata ayıklama için ham zaman sütunu seçeneği
+        self.debug_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            output_frame,
+            text="Ham zaman değerini ekle (original_time sütunu, hata ayıklama için)",
+            variable=self.debug_var
+        ).pack(anchor=tk.W, padx=5)
+        
         # Durum çubuğu
         self.status_var = tk.StringVar(value="Hazır")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X, pady=5)
         
-        # İlerleme çubuğu
-        self.progress = ttk.Progressbar(main_frame, orient=tk.HORIZONTAL, length=100, mode='indeterminate')
+        # İlerleme çubuğu: parçalı indirmelerde tamamlanan istek oranını (yüzde), tek istekte etkinliği gösterir
+        self.progress = ttk.Progressbar(main_frame, orient=tk.HORIZONTAL, length=100, mode='determinate', maximum=100)
         self.progress.pack(side=tk.BOTTOM, fill=tk.X, pady=5)
         
         # İndir butonu - Daha büyük ve belirgin
         download_frame = ttk.Frame(main_frame)
         download_frame.pack(fill=tk.X, pady=15)
         
-        download_button = ttk.Button(
+        self.download_button = ttk.Button(
             download_frame, 
             text="DEPREM VERİLERİNİ İNDİR", 
             command=self.download_earthquakes,
             style="Download.TButton"
         )
-        download_button.pack(ipadx=20, ipady=10, fill=tk.X)
+        self.download_button.pack(ipadx=20, ipady=10, fill=tk.X)
+        
+        # Kaydırma etiketini canvas'a ve içindeki tüm öğelere ekle
+        widgets = [canvas]
+        while widgets:
+            widget = widgets.pop()
+            widget.bindtags(widget.bindtags() + (SCROLL_TAG,))
+            widgets.extend(widget.winfo_children())
+    
+    def set_vars(self, variables, values):
+        """Birden çok Tk değişkenini tek bir Tcl çağrısıyla ayarla.
         
-        # Özel buton stili
-        style = ttk.Style()
-        style.configure("Download.TButton", font=("Arial", 12, "bold"))
+        Tcl'nin lassign komutu listeyi sırayla değişkenlere atar; her değişken
+        için ayrı set çağrısı yapmaktan kaçınılır.
+        """
+        self.root.tk.call("lassign", tuple(str(value) for value in values), *(str(var) for var in variables))
     
     def on_region_selected(self, event):
         """Hazır bölge seçildiğinde koordinatları güncelle."""
-        selected_region = self.region_var.get()
-        if selected_region in self.region_presets:
-            region = self.region_presets[selected_region]
-            self.min_lat_var.set(str(region["min_lat"]))
-            self.max_lat_var.set(str(region["max_lat"]))
-            self.min_lon_var.set(str(region["min_lon"]))
-            self.max_lon_var.set(str(region["max_lon"]))
+        region = REGION_PRESETS.get(self.region_var.get())
+        if region is not None:
+            # (min_lat, max_lat, min_lon, max_lon) sırası _coord_vars ile aynı
+            self.set_vars(self._coord_vars, region)
     
     def on_time_selected(self, event):
         """Hazır zaman aralığı seçildiğinde tarihleri güncelle."""
-        selected_time = self.time_var.get()
-        if selected_time in self.time_presets:
-            days = self.time_presets[selected_time]["days"]
+        days = TIME_PRESETS.get(self.time_var.get())
+        if days is not None:
             # Şu anki zamanı yerel zaman diliminde al
             end_date = datetime.datetime.now().replace(microsecond=0)
             start_date = end_date - datetime.timedelta(days=days)
             
             # Tarihleri YYYY-MM-DD formatında ayarla
-            self.start_date_var.set(start_date.strftime("%Y-%m-%d"))
-            self.end_date_var.set(end_date.strftime("%Y-%m-%d"))
+            self.set_vars(
+                (self.start_date_var, self.end_date_var),
+                (start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+            )
     
     def browse_output_file(self):
         """Çıktı dosyası için dosya tarayıcısını aç."""
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Dosyaları", "*.csv"), ("Tüm Dosyalar", "*.*")],
+            filetypes=[
+                ("CSV Dosyaları", "*.csv"),
+                ("Parquet Dosyaları", "*.parquet"),
+                ("Feather Dosyaları", "*.feather"),
+                ("JSON Lines Dosyaları", "*.jsonl"),
+                ("Tüm Dosyalar", "*.*")
+            ],
             title="Deprem Verilerini Kaydet"
         )
         if filename:
             self.output_var.set(filename)
     
-    def validate_inputs(self):
-        """Kullanıcı girdilerini doğrula."""
+    def call_in_ui(self, func, *args):
+        """Tk çağrısını indirme iş parçacığından güvenle yap.
+        
+        tkthread yüklüyse çağrı doğrudan yapılır ve yamalı tkinter tarafından ana
+        yorumlayıcıya iletilir; değilse after(0) ile ana döngünün kuyruğuna eklenir.
+        Pencere kapatıldıktan sonra çağrılar sessizce yok sayılır.
+        """
+        if self._closing:
+            return
         try:
-            min_lat = float(self.min_lat_var.get())
-            max_lat = float(self.max_lat_var.get())
-            min_lon = float(self.min_lon_var.get())
-            max_lon = float(self.max_lon_var.get())
-            
-            if min_lat < -90 or max_lat > 90 or min_lat >= max_lat:
-                messagebox.showerror("Hata", "Geçersiz enlem değerleri. Enlem -90 ile 90 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır.")
-                return False
-            
-            if min_lon < -180 or max_lon > 180 or min_lon >= max_lon:
-                messagebox.showerror("Hata", "Geçersiz boylam değerleri. Boylam -180 ile 180 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır.")
-                return False
-            
-            min_mag = float(self.min_mag_var.get())
-            max_mag = float(self.max_mag_var.get())
-            
-            if min_mag < 0 or max_mag > 10 or min_mag >= max_mag:
-                messagebox.showerror("Hata", "Geçersiz büyüklük değerleri. Büyüklük 0 ile 10 arasında olmalı ve minimum değer maksimum değerden küçük olmalıdır.")
-                return False
-            
-            # Tarihleri doğrula
-            start_date_str = self.start_date_var.get()
-            end_date_str = self.end_date_var.get()
-            
+            if tkthread is not None:
+                func(*args)
+            else:
+                self.root.after(0, lambda: func(*args))
+        except (RuntimeError, tk.TclError):
+            # Kontrolden hemen sonra pencere yok edildiyse
+            pass
+    
+    def set_progress(self, value):
+        """Animasyonu durdur ve ilerleme çubuğunu verilen yüzdeye ayarla (ana iş parçacığında)."""
+        self.progress.stop()
+        self.progress.configure(mode="determinate", value=value)
+    
+    def report_progress(self, done, total):
+        """Tamamlanan istek sayısını ilerleme çubuğuna yansıt (indirme iş parçacığından çağrılır).
+        
+        Tek istekli indirmelerde ara ilerleme bilinmediğinden çubuk belirsiz modda
+        hareket etmeye devam eder; yalnızca parçalı indirmelerde yüzde gösterilir.
+        """
+        if total > 1:
+            self.call_in_ui(self.set_progress, 100 * done / total)
+    
+    def reset_progress(self):
+        """İlerleme çubuğunu sıfırla (başarısız veya sonuçsuz indirmeden sonra)."""
+        self.call_in_ui(self.set_progress, 0)
+    
+    def show_error(self, message):
+        """Hata mesajını ana iş parçacığında göster."""
+        self.call_in_ui(messagebox.showerror, "Hata", message)
+    
+    def read_inputs(self):
+        """Giriş alanlarının anlık değerlerini oku.
+        
+        Ana iş parçacığında çağrılır; indirme iş parçacığı Tk değişkenlerine
+        dokunmaz ve kullanıcı indirme sırasında alanları değiştirse bile
+        doğrulanan değerlerle indirilen değerler aynı kalır.
+        """
+        return {
+            "min_lat": self.min_lat_var.get(),
+            "max_lat": self.max_lat_var.get(),
+            "min_lon": self.min_lon_var.get(),
+            "max_lon": self.max_lon_var.get(),
+            "min_mag": self.min_mag_var.get(),
+            "max_mag": self.max_mag_var.get(),
+            "start_date": self.start_date_var.get(),
+            "end_date": self.end_date_var.get(),
+            "output_file": self.output_var.get(),
+            "debug": self.debug_var.get()
+        }
+    
+    def validate_inputs(self, inputs):
+        """Okunan girdileri doğrula ve ayrıştırılmış parametreleri döndür.
+        
+        İndirme iş parçacığında çalışır; girdiler geçersizse hata mesajı
+        gösterilir ve None döndürülür.
+        """
+        # Her alan ayrı ayrı ayrıştırılır, böylece hangi alanın hatalı olduğu bildirilir
+        values = {}
+        for key, label in NUMERIC_FIELDS:
             try:
-                validate_dates(start_date_str, end_date_str)
-            except Exception as e:
-                messagebox.showerror("Hata", f"Tarih doğrulama hatası: {e}")
-                return False
-            
-            # Çıktı dosyasını doğrula
-            output_file = self.output_var.get()
-            if not output_file:
-                messagebox.showerror("Hata", "Lütfen bir çıktı dosya adı belirtin.")
-                return False
+                values[key] = float(inputs[key])
+            except ValueError:
+                self.show_error(f"Giriş doğrulama hatası: {label} için geçerli bir sayı girin ('{inputs[key]}').")
+                return None
+        
+        for min_key, max_key, low, high, message in RANGE_CHECKS:
+            # Zincirleme karşılaştırma tek ifadede sınırları ve sırayı denetler; NaN da reddedilir
+            if not low <= values[min_key] < values[max_key] <= high:
+                self.show_error(message)
+                return None
+        
+        # Tarihleri doğrula
+        from emsc_earthquake_data import validate_dates
+        
+        try:
+            start_date, end_date = validate_dates(inputs["start_date"], inputs["end_date"])
+        except SystemExit:
+            # validate_dates komut satırı için hata durumunda sys.exit çağırır
+            self.show_error("Tarih doğrulama hatası: Tarihler YYYY-MM-DD formatında olmalı ve bitiş tarihi başlangıç tarihinden sonra olmalıdır.")
+            return None
+        
+        # Çıktı dosyasını doğrula
+        output_file = inputs["output_file"]
+        if not output_file:
+            self.show_error("Lütfen bir çıktı dosya adı belirtin.")
+            return None
+        
+        values.update(
+            start_date=start_date,
+            end_date=end_date,
+            output_file=output_file,
+            debug=inputs["debug"]
+        )
+        return values
+    
+    def get_download_pool(self):
+        """İndirme sürecini ve ilerleme kuyruğunu gerekirse oluştur (ana iş parçacığında çağrılır).
+        
+        JSON ayrıştırma ve DataFrame dönüşümü GIL'i uzun süre tutar; arayüz donmasın
+        diye indirme ayrı bir süreçte yapılır. Tk yorumlayıcısı fork ile kopyalanmasın
+        diye spawn kullanılır; süreç bir kez başlatılır, böylece yorumlayıcı açılışı
+        ve pandas/pyarrow içe aktarımı her indirmede tekrarlanmaz.
+        """
+        if self._download_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
             
-            return True
-        except ValueError as e:
-            messagebox.showerror("Hata", f"Giriş doğrulama hatası: {e}")
-            return False
+            context = multiprocessing.get_context("spawn")
+            self._download_queue = context.Queue()
+            self._download_pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=context,
+                initializer=_init_download_process, initargs=(self._download_queue,)
+            )
+        return self._download_pool, self._download_queue
+    
+    def on_close(self):
+        """Pencere kapatılırken indirme sürecini sonlandır."""
+        self._closing = True
+        if self._download_pool is not None:
+            # shutdown çalışan işi durdurmaz ve yorumlayıcı çıkışta sürecin bitmesini
+            # bekler; bu yüzden devam eden indirme süreci önce sonlandırılır
+            for process in list((self._download_pool._processes or {}).values()):
+                process.terminate()
+            self._download_pool.shutdown(wait=False, cancel_futures=True)
+            self._download_pool = None
+        self.root.destroy()
     
     def download_earthquakes(self):
         """Deprem verilerini indir."""
-        if not self.validate_inputs():
-            return
+        # İndirme sürecinde tek iş ve tek ilerleme kuyruğu var; indirme bitene kadar butonu kapat
+        self.download_button.state(["disabled"])
         
-        # İlerleme çubuğunu başlat
+        # İstek sayısı belli olana kadar ilerleme çubuğu belirsiz modda hareket eder
+        self.progress.configure(mode="indeterminate", value=0)
         self.progress.start()
         self.status_var.set("Deprem verileri indiriliyor...")
-        self.root.update()
         
-        # İndirme işlemini ayrı bir iş parçacığında başlat
-        threading.Thread(target=self._download_thread, daemon=True).start()
+        # Doğrulama ve indirme işlemini, girdilerin anlık kopyasıyla ayrı bir iş parçacığında başlat
+        threading.Thread(
+            target=self._download_thread, args=(self.read_inputs(),) + self.get_download_pool(), daemon=True
+        ).start()
     
-    def _download_thread(self):
+    def _download_thread(self, inputs, pool, progress_queue):
         """Deprem verilerini indirme iş parçacığı."""
+        import queue
+        from concurrent.futures.process import BrokenProcessPool
+        
         try:
-            min_lat = float(self.min_lat_var.get())
-            max_lat = float(self.max_lat_var.get())
-            min_lon = float(self.min_lon_var.get())
-            max_lon = float(self.max_lon_var.get())
-            min_mag = float(self.min_mag_var.get())
-            max_mag = float(self.max_mag_var.get())
+            params = self.validate_inputs(inputs)
+            if params is None:
+                self.reset_progress()
+                self.call_in_ui(self.status_var.set, "Hazır")
+                return
             
-            start_date_str = self.start_date_var.get()
-            end_date_str = self.end_date_var.get()
-            output_file = self.output_var.get()
+            # Önceki indirmeden geç ulaşmış bildirimleri at
+            while True:
+                try:
+                    progress_queue.get_nowait()
+                except queue.Empty:
+                    break
             
-            start_date, end_date = validate_dates(start_date_str, end_date_str)
+            # İndirme, işleme ve kaydetme alt süreçte yapılır; pandas yalnızca orada içe aktarılır
+            future = pool.submit(_run_download, params)
             
-            # Deprem verilerini al
-            earthquake_features = get_earthquake_data(
-                min_lat, max_lat, 
-                min_lon, max_lon,
-                start_date, end_date,
-                min_mag, max_mag
-            )
+            # Sonuç gelene kadar alt süreçten gelen ilerleme bildirimlerini aktar
+            while not future.done():
+                try:
+                    self.report_progress(*progress_queue.get(timeout=0.1))
+                except queue.Empty:
+                    pass
             
-            if not earthquake_features:
-                self.root.after(0, lambda: messagebox.showinfo("Bilgi", "Belirtilen parametreler için deprem verisi bulunamadı."))
-                self.root.after(0, lambda: self.status_var.set("Hazır"))
-                self.root.after(0, self.progress.stop)
-                return
-            
-            # Verileri işle
-            df = process_earthquake_data(earthquake_features)
-            
-            if df is None or df.empty:
-                self.root.after(0, lambda: messagebox.showerror("Hata", "Deprem verilerini işlerken bir hata oluştu."))
-                self.root.after(0, lambda: self.status_var.set("Hazır"))
-                self.root.after(0, self.progress.stop)
-                return
+            written = future.result()
             
-            # CSV olarak kaydet
-            success = save_to_csv(df, output_file)
+            # Sonuç geldiğinde kuyrukta kalmış bildirimleri de aktar
+            while True:
+                try:
+                    self.report_progress(*progress_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-            if success:
-                self.root.after(0, lambda: messagebox.showinfo("Başarılı", f"{len(df)} deprem kaydı başarıyla {output_file} dosyasına kaydedildi."))
-                self.root.after(0, lambda: self.status_var.set(f"{len(df)} deprem kaydı indirildi."))
+            output_file = params["output_file"]
+            if written is None:
+                self.reset_progress()
+                self.call_in_ui(self.status_var.set, "Hata oluştu.")
+                self.show_error("Deprem verilerini indirirken, işlerken veya dosyaya kaydederken bir hata oluştu.")
+            elif written == 0:
+                self.reset_progress()
+                self.call_in_ui(self.status_var.set, "Hazır")
+                self.call_in_ui(messagebox.showinfo, "Bilgi", "Belirtilen parametreler için deprem verisi bulunamadı.")
             else:
-                self.root.after(0, lambda: messagebox.showerror("Hata", "Deprem verilerini CSV dosyasına kaydederken bir hata oluştu."))
-                self.root.after(0, lambda: self.status_var.set("Hata oluştu."))
+                self.call_in_ui(self.set_progress, 100)
+                self.call_in_ui(self.status_var.set, f"{written} deprem kaydı indirildi.")
+                self.call_in_ui(messagebox.showinfo, "Başarılı", f"{written} deprem kaydı başarıyla {output_file} dosyasına kaydedildi.")
             
+        except BrokenProcessPool as e:
+            # Alt süreç beklenmedik şekilde sonlandı; sonraki indirmede yeni süreç oluşturulur
+            if self._download_pool is pool:
+                self._download_pool = None
+            self.reset_progress()
+            self.call_in_ui(self.status_var.set, "Hata oluştu.")
+            self.show_error(f"Deprem verilerini indirirken bir hata oluştu: {e}")
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Hata", f"Deprem verilerini indirirken bir hata oluştu: {e}"))
-            self.root.after(0, lambda: self.status_var.set("Hata oluştu."))
+            self.reset_progress()
+            self.call_in_ui(self.status_var.set, "Hata oluştu.")
+            self.show_error(f"Deprem verilerini indirirken bir hata oluştu: {e}")
         finally:
-            self.root.after(0, self.progress.stop)
+            self.call_in_ui(self.download_button.state, ["!disabled"])
 
 def main():
     """Ana fonksiyon."""